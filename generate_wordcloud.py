@@ -4,43 +4,24 @@
 
 import os
 import sys
-import glob
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
+from functools import lru_cache
 from wordcloud import WordCloud
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                              QHBoxLayout, QLabel, QLineEdit, QPushButton,
-                             QTextEdit, QFileDialog, QMessageBox, QProgressBar)
-from PyQt6.QtCore import Qt, QThread, pyqtSignal
-from PyQt6.QtGui import QPixmap, QFont
+                             QTextEdit, QFileDialog, QMessageBox, QProgressBar,
+                             QSizePolicy)
+from PyQt6.QtCore import Qt, QThread, QEvent, pyqtSignal
+from PyQt6.QtGui import QPixmap, QFont, QImage
+import numpy as np
 import matplotlib.pyplot as plt
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
-
-def read_all_txt_files(txt_dir):
-    """读取指定目录下的所有txt文件并合并文本"""
-    if not os.path.exists(txt_dir):
-        print(f"错误: 目录不存在 {txt_dir}")
-        return ""
-
-    txt_files = glob.glob(os.path.join(txt_dir, "*.txt"))
-    all_text = ""
-
-    print(f"找到 {len(txt_files)} 个txt文件")
-
-    for txt_file in txt_files:
-        print(f"读取: {os.path.basename(txt_file)}")
-        try:
-            with open(txt_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-                all_text += content + "\n"
-        except Exception as e:
-            print(f"读取文件 {txt_file} 时出错: {e}")
-
-    return all_text
-
-def generate_wordcloud(text, output_path, width=1920, height=1080):
-    """生成词云并保存"""
-    print("\n正在生成词云...")
+from wordcloud_utils import read_all_txt_files
 
+@lru_cache(maxsize=1)
+def _find_font_path():
+    """查找可用的字体文件，结果在进程内缓存"""
     # 尝试使用系统字体，如果失败则使用默认字体
     font_paths = [
         '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf',
@@ -49,14 +30,19 @@ def generate_wordcloud(text, output_path, width=1920, height=1080):
         '/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf',
     ]
 
-    font_path = None
     for fp in font_paths:
         if os.path.exists(fp):
-            font_path = fp
-            print(f"使用字体: {font_path}")
-            break
+            return fp
+    return None
 
-    if not font_path:
+def generate_wordcloud(text, output_path, width=1920, height=1080, show=False):
+    """生成词云并保存"""
+    print("\n正在生成词云...")
+
+    font_path = _find_font_path()
+    if font_path:
+        print(f"使用字体: {font_path}")
+    else:
         print("警告: 未找到合适的字体，使用默认字体（可能不支持中文）")
 
     # 配置词云参数
@@ -73,7 +59,10 @@ def generate_wordcloud(text, output_path, width=1920, height=1080):
     if font_path:
         wordcloud_kwargs['font_path'] = font_path
 
-    wordcloud = WordCloud(**wordcloud_kwargs).generate(text)
+    # 每次都新建：random_state会变成一个Random实例，复用会让同样的输入得到不同的图片
+    # GUI开启了词汇搭配，二元组统计交给WordCloud自己做
+    wordcloud = WordCloud(**wordcloud_kwargs)
+    wordcloud.generate(text)
 
     # 确保输出目录存在
     output_dir = os.path.dirname(output_path)
@@ -84,27 +73,33 @@ def generate_wordcloud(text, output_path, width=1920, height=1080):
     wordcloud.to_file(output_path)
     print(f"词云已保存到: {output_path}")
 
-    # 显示词云（可选）
-    plt.figure(figsize=(16, 9))
-    plt.imshow(wordcloud, interpolation='bilinear')
-    plt.axis('off')
-    plt.tight_layout(pad=0)
-
-    # 不显示图片，只保存文件
-    # plt.show()
+    # 显示词云（可选）：默认只保存文件，GUI通过 MainWindow.display_wordcloud 显示
+    if show:
+        plt.figure(figsize=(16, 9))
+        plt.imshow(wordcloud, interpolation='bilinear')
+        plt.axis('off')
+        plt.tight_layout(pad=0)
+        plt.show()
 
     return wordcloud
 
+def _generate_in_process(text, output_path):
+    """在子进程中生成词云，只把可序列化的图像数组和词频传回GUI进程"""
+    wordcloud = generate_wordcloud(text, output_path)
+    return wordcloud.to_array(), wordcloud.words_
+
 class WordCloudWorker(QThread):
-    """词云生成工作线程"""
+    """词云生成工作线程，CPU密集的布局计算交给子进程完成"""
     progress = pyqtSignal(int)
-    finished = pyqtSignal(object, str)
+    finished = pyqtSignal(object, object, str)
     error = pyqtSignal(str)
+    pool_broken = pyqtSignal()
 
-    def __init__(self, txt_dir, output_path):
+    def __init__(self, txt_dir, output_path, executor):
         super().__init__()
         self.txt_dir = txt_dir
         self.output_path = output_path
+        self.executor = executor
 
     def run(self):
         try:
@@ -116,9 +111,16 @@ class WordCloudWorker(QThread):
                 self.error.emit("没有读取到任何文本内容")
                 return
 
-            wordcloud = generate_wordcloud(all_text, self.output_path)
+            future = self.executor.submit(_generate_in_process, all_text,
+                                          self.output_path)
+            self.progress.emit(60)
+            image, words = future.result()
             self.progress.emit(100)
-            self.finished.emit(wordcloud, all_text)
+            self.finished.emit(image, words, all_text)
+        except BrokenProcessPool as e:
+            # 子进程崩溃后这个执行器就不能再用了，通知主窗口重建
+            self.pool_broken.emit()
+            self.error.emit(f"词云生成进程异常退出: {e}")
         except Exception as e:
             self.error.emit(str(e))
 
@@ -126,6 +128,7 @@ class MainWindow(QMainWindow):
     """主窗口"""
     def __init__(self):
         super().__init__()
+        self.executor = self.create_executor()
         self.init_ui()
 
     def init_ui(self):
@@ -182,8 +185,17 @@ class MainWindow(QMainWindow):
         layout.addWidget(self.status_text)
 
         # 词云显示区域
-        self.wordcloud_canvas = None
         layout.addWidget(QLabel("生成的词云:"))
+        self.wordcloud_label = QLabel()
+        self.wordcloud_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        # 忽略图片自身尺寸，避免缩放后的图片把窗口撑大
+        self.wordcloud_label.setSizePolicy(QSizePolicy.Policy.Ignored,
+                                           QSizePolicy.Policy.Ignored)
+        layout.addWidget(self.wordcloud_label, 1)
+        self.wordcloud_array = None
+        self.wordcloud_pixmap = None
+        # 标签大小变化时从原图重新缩放，避免在已缩放的图上反复缩放
+        self.wordcloud_label.installEventFilter(self)
 
     def select_directory(self):
         directory = QFileDialog.getExistingDirectory(self, "选择文本目录")
@@ -215,25 +227,25 @@ class MainWindow(QMainWindow):
         self.progress_bar.setValue(0)
         self.status_text.append("开始生成词云...")
 
-        self.worker = WordCloudWorker(txt_dir, output_path)
+        self.worker = WordCloudWorker(txt_dir, output_path, self.executor)
         self.worker.progress.connect(self.progress_bar.setValue)
         self.worker.finished.connect(self.on_finished)
         self.worker.error.connect(self.on_error)
+        self.worker.pool_broken.connect(self.reset_executor)
         self.worker.start()
 
-    def on_finished(self, wordcloud, all_text):
+    def on_finished(self, image, words, all_text):
         self.progress_bar.setVisible(False)
         self.generate_button.setEnabled(True)
         self.status_text.append("词云生成完成！")
 
         # 显示词频统计
-        words = wordcloud.words_
         self.status_text.append("\n高频词汇统计:")
         for i, (word, freq) in enumerate(list(words.items())[:20], 1):
             self.status_text.append(f"{i:2d}. {word:20s} - {freq:.3f}")
 
         # 显示词云图片
-        self.display_wordcloud(wordcloud)
+        self.display_wordcloud(image)
 
         QMessageBox.information(self, "完成", "词云生成成功！")
 
@@ -243,21 +255,46 @@ class MainWindow(QMainWindow):
         self.status_text.append(f"错误: {error_msg}")
         QMessageBox.critical(self, "错误", error_msg)
 
-    def display_wordcloud(self, wordcloud):
-        if self.wordcloud_canvas:
-            self.wordcloud_canvas.setParent(None)
-
-        fig = Figure(figsize=(12, 8))
-        self.wordcloud_canvas = FigureCanvas(fig)
-        self.wordcloud_canvas.figure.clear()
-        ax = self.wordcloud_canvas.figure.add_subplot(111)
-        ax.imshow(wordcloud, interpolation='bilinear')
-        ax.axis('off')
-        self.wordcloud_canvas.figure.tight_layout(pad=0)
+    @staticmethod
+    def create_executor():
+        # 单个常驻子进程，多次点击复用，避免重复的进程启动开销
+        # 用spawn启动：在运行中的多线程Qt进程里fork不安全
+        return ProcessPoolExecutor(max_workers=1,
+                                   mp_context=multiprocessing.get_context('spawn'))
+
+    def reset_executor(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.executor = self.create_executor()
+
+    def closeEvent(self, event):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        super().closeEvent(event)
+
+    def display_wordcloud(self, image):
+        # 直接把词云的RGB数组交给QImage，不再经过matplotlib渲染
+        # QImage不复制数据，数组保存在self上以保证缓冲区存活
+        self.wordcloud_array = np.ascontiguousarray(image)
+        h, w, _ = self.wordcloud_array.shape
+        qimg = QImage(self.wordcloud_array.data, w, h, 3 * w,
+                      QImage.Format.Format_RGB888)
+        self.wordcloud_pixmap = QPixmap.fromImage(qimg)
+        self.rescale_wordcloud()
+
+    def rescale_wordcloud(self):
+        """按标签当前大小缩放原始词云图"""
+        if self.wordcloud_pixmap is None:
+            return
+        pixmap = self.wordcloud_pixmap.scaled(
+            self.wordcloud_label.size(),
+            Qt.AspectRatioMode.KeepAspectRatio,
+            Qt.TransformationMode.SmoothTransformation
+        )
+        self.wordcloud_label.setPixmap(pixmap)
 
-        central_widget = self.centralWidget()
-        layout = central_widget.layout()
-        layout.addWidget(self.wordcloud_canvas)
+    def eventFilter(self, obj, event):
+        if obj is self.wordcloud_label and event.type() == QEvent.Type.Resize:
+            self.rescale_wordcloud()
+        return super().eventFilter(obj, event)
 
 def main():
     app = QApplication(sys.argv)
@@ -266,4 +303,6 @@ def main():
     sys.exit(app.exec())
 
 if __name__ == "__main__":
+    # PyInstaller打包后子进程需要这一步才能正常启动
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
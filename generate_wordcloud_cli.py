@@ -3,45 +3,56 @@
 """词云生成器 - CLI版本"""
 
 import os
+import re
 import sys
-import glob
+from collections import Counter
+from functools import lru_cache
 import argparse
 from wordcloud import WordCloud
+from wordcloud.tokenization import score
 import matplotlib.pyplot as plt
-
-def read_all_txt_files(txt_dir):
-    """读取指定目录下的所有txt文件并合并文本"""
-    if not os.path.exists(txt_dir):
-        print(f"错误: 目录不存在 {txt_dir}")
-        return ""
-
-    txt_files = glob.glob(os.path.join(txt_dir, "*.txt"))
-    all_text = ""
-
-    print(f"找到 {len(txt_files)} 个txt文件")
-
-    for txt_file in txt_files:
-        print(f"读取: {os.path.basename(txt_file)}")
-        try:
-            with open(txt_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-                all_text += content + "\n"
-        except Exception as e:
-            print(f"读取文件 {txt_file} 时出错: {e}")
-
-    return all_text
-
-def generate_wordcloud(text, output_path, width=1920, height=1080,
-                      background_color='black', max_words=1000,
-                      colormap='plasma', relative_scaling=0.6,
-                      collocations=False, prefer_horizontal=0.9):
-    """生成词云并保存 - 新参数配置"""
-    print(f"\n正在生成词云...")
-    print(f"图片尺寸: {width}x{height}")
-    print(f"背景色: {background_color}")
-    print(f"最大词汇数: {max_words}")
-    print(f"配色方案: {colormap}")
-
+from wordcloud_utils import HAS_NUMBA, _fuse_counts, count_words, read_all_txt_files
+
+# 与WordCloud默认一致的分词正则
+_TOKEN_RE = re.compile(r"\w[\w']*")
+
+def count_with_collocations(text, stopwords=(), normalize_plurals=True, threshold=30):
+    """
+    结果与 WordCloud.process_text 开启搭配时一致，
+    但单词和二元组都先用Counter整体计数，逐词的Python循环只剩去重后的词
+    """
+    # 与process_text相同：去掉 's 和纯数字
+    words = [w[:-2] if w.lower().endswith("'s") else w
+             for w in _TOKEN_RE.findall(text)]
+    words = [w for w in words if not w.isdigit()]
+    stopwords = {w.lower() for w in stopwords}
+    is_stop = [w.lower() in stopwords for w in words]
+
+    # 先组二元组再去停用词，避免停用词两侧的词被拼成词组
+    bigrams = Counter(f"{w1} {w2}" for w1, w2, s1, s2
+                      in zip(words, words[1:], is_stop, is_stop[1:])
+                      if not s1 and not s2)
+    unigrams = Counter(w for w, stop in zip(words, is_stop) if not stop)
+    n_words = sum(unigrams.values())
+
+    counts_unigrams, standard_form = _fuse_counts(unigrams, normalize_plurals)
+    counts_bigrams, _ = _fuse_counts(bigrams, normalize_plurals)
+    orig_counts = counts_unigrams.copy()
+
+    # 与WordCloud相同的打分方式：搭配成立时把次数从单词转移到词组上
+    for bigram_string, count in counts_bigrams.items():
+        word1, word2 = bigram_string.split(" ")
+        word1 = standard_form[word1.lower()]
+        word2 = standard_form[word2.lower()]
+        if score(count, orig_counts[word1], orig_counts[word2], n_words) > threshold:
+            counts_unigrams[word1] -= count
+            counts_unigrams[word2] -= count
+            counts_unigrams[bigram_string] = count
+    return {word: count for word, count in counts_unigrams.items() if count > 0}
+
+@lru_cache(maxsize=1)
+def _find_font_path():
+    """查找可用的字体文件，结果在进程内缓存"""
     # 跨平台字体路径 - Windows/Linux/macOS
     font_paths = [
         # Windows
@@ -58,14 +69,27 @@ def generate_wordcloud(text, output_path, width=1920, height=1080,
         '/System/Library/Fonts/PingFang.ttc',
     ]
 
-    font_path = None
     for fp in font_paths:
         if os.path.exists(fp):
-            font_path = fp
-            print(f"使用字体: {font_path}")
-            break
+            return fp
+    return None
+
+def generate_wordcloud(text, output_path, width=1920, height=1080,
+                      background_color='black', max_words=1000,
+                      colormap='plasma', relative_scaling=0.6,
+                      collocations=False, prefer_horizontal=0.9,
+                      show=False):
+    """生成词云并保存 - 新参数配置"""
+    print(f"\n正在生成词云...")
+    print(f"图片尺寸: {width}x{height}")
+    print(f"背景色: {background_color}")
+    print(f"最大词汇数: {max_words}")
+    print(f"配色方案: {colormap}")
 
-    if not font_path:
+    font_path = _find_font_path()
+    if font_path:
+        print(f"使用字体: {font_path}")
+    else:
         print("警告: 未找到合适的字体，使用默认字体（可能不支持中文）")
 
     # 配置词云参数 - 使用新的参数
@@ -86,7 +110,20 @@ def generate_wordcloud(text, output_path, width=1920, height=1080,
     if font_path:
         wordcloud_kwargs['font_path'] = font_path
 
-    wordcloud = WordCloud(**wordcloud_kwargs).generate(text)
+    wordcloud = WordCloud(**wordcloud_kwargs)
+    if collocations:
+        freqs = count_with_collocations(text, wordcloud.stopwords,
+                                        wordcloud.normalize_plurals,
+                                        wordcloud.collocation_threshold)
+    elif HAS_NUMBA:
+        freqs = count_words(text, wordcloud.stopwords, wordcloud.normalize_plurals)
+    else:
+        freqs = None
+    # 预统计没有得到任何词时交给WordCloud自己分词
+    if freqs:
+        wordcloud.generate_from_frequencies(freqs)
+    else:
+        wordcloud.generate(text)
 
     # 确保输出目录存在
     output_dir = os.path.dirname(output_path)
@@ -97,7 +134,13 @@ def generate_wordcloud(text, output_path, width=1920, height=1080,
     wordcloud.to_file(output_path)
     print(f"词云已保存到: {output_path}")
 
-
+    # 显示词云（可选）：只有传入 --show 时才创建matplotlib图像
+    if show:
+        plt.figure(figsize=(16, 9))
+        plt.imshow(wordcloud, interpolation='bilinear')
+        plt.axis('off')
+        plt.tight_layout(pad=0)
+        plt.show()
 
     return wordcloud
 
@@ -122,6 +165,8 @@ def main():
                        help='禁用词汇搭配')
     parser.add_argument('--prefer-horizontal', type=float, default=0.9,
                        help='水平排列比例 (默认: 0.9)')
+    parser.add_argument('--show', action='store_true',
+                       help='生成后显示词云窗口')
 
     args = parser.parse_args()
 
@@ -129,7 +174,11 @@ def main():
     print("=" * 60)
     print("词云生成器 - CLI版本")
     print("=" * 60)
-    all_text = read_all_txt_files(args.txt_dir)
+    try:
+        all_text = read_all_txt_files(args.txt_dir)
+    except OSError as e:
+        print(f"错误: {e}")
+        sys.exit(1)
 
     if not all_text.strip():
         print("错误: 没有读取到任何文本内容")
@@ -148,7 +197,8 @@ def main():
         colormap=args.colormap,
         relative_scaling=args.relative_scaling,
         collocations=not args.no_collocations,
-        prefer_horizontal=args.prefer_horizontal
+        prefer_horizontal=args.prefer_horizontal,
+        show=args.show
     )
 
     # 显示词频统计
@@ -9,12 +9,27 @@ API文档: https://ghost.org/docs/api/v3/content/
 import json
 import os
 import re
+from collections import deque
+from itertools import chain, islice
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import List, Dict
 import requests
 import logging
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+    HAS_SELECTOLAX = True
+except ImportError:
+    HAS_SELECTOLAX = False
+
 # 配置日志
 logging.basicConfig(
     level=logging.INFO,
@@ -26,6 +41,28 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# 预编译的正则表达式
+_SCRIPT_RE = re.compile(r'<(script|style)[^>]*>.*?</\1>', re.DOTALL)
+_TAG_RE = re.compile(r'<[^>]+>')
+_WS_RE = re.compile(r'\n+')
+_FNAME_RE = re.compile(r'[<>:"/\\|?*]')
+
+
+def write_json(path: Path, data) -> None:
+    """
+    以缩进格式写入JSON文件，优先使用orjson
+
+    Args:
+        path: 输出文件路径
+        data: 要序列化的数据
+    """
+    if HAS_ORJSON:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+
 
 class GhostPostFetcher:
     """Ghost博客文章获取器"""
@@ -45,6 +82,47 @@ class GhostPostFetcher:
         self.session.headers.update({
             'User-Agent': 'Ghost Post Fetcher/1.0'
         })
+        # 已经创建过的目录，避免重复的 stat/mkdir 系统调用
+        self._ensured: set[str] = set()
+
+    def _ensure_dir(self, path) -> None:
+        """
+        确保目录存在，每个目录只创建一次
+
+        Args:
+            path: 目录路径
+        """
+        key = str(path)
+        if key not in self._ensured:
+            Path(path).mkdir(parents=True, exist_ok=True)
+            self._ensured.add(key)
+
+    def _fetch_page(self, page: int, per_page: int) -> requests.Response:
+        """
+        请求单页博文
+
+        Args:
+            page: 页码，从1开始
+            per_page: 每页文章数
+
+        Returns:
+            HTTP响应
+        """
+        params = {
+            'key': self.api_key,
+            'page': page,
+            'limit': per_page,
+            'include': 'tags,authors',  # 同时获取标签和作者信息
+            'formats': 'html',  # 获取HTML格式内容
+        }
+
+        response = self.session.get(
+            f"{self.base_url}/posts/",
+            params=params,
+            timeout=30
+        )
+        response.raise_for_status()
+        return response
 
     def fetch_all_posts(self, limit: int = None) -> List[Dict]:
         """
@@ -56,44 +134,50 @@ class GhostPostFetcher:
         Returns:
             博文列表
         """
-        all_posts = []
+        # 按页暂存，最后一次性展开，避免逐页extend导致的列表扩容
+        pages = deque()
+        total = 0
         page = 1
         per_page = min(limit or 100, 100)  # Ghost API最多支持100条/页
 
         logger.info(f"开始获取博文数据...")
 
-        while True:
-            logger.info(f"正在获取第 {page} 页...")
-
-            params = {
-                'key': self.api_key,
-                'page': page,
-                'limit': per_page,
-                'include': 'tags,authors',  # 同时获取标签和作者信息
-                'formats': 'html',  # 获取HTML格式内容
-            }
-
-            if limit:
-                remaining = limit - len(all_posts)
-                params['limit'] = min(remaining, per_page)
-
-            try:
-                response = self.session.get(
-                    f"{self.base_url}/posts/",
-                    params=params,
-                    timeout=30
-                )
-                response.raise_for_status()
-
-                data = response.json()
+        # 两级流水线：解析当前页的同时，下一页的请求已经在路上
+        # 每页大小保持不变，否则Ghost按 (page-1)*limit 计算的偏移会错位
+        # 只有从第一页的 meta.pagination.pages 得知总页数后才提前发请求，
+        # 避免在最后一页之后多发一个用不上的请求
+        total_pages = None
+        executor = ThreadPoolExecutor(max_workers=2)
+        try:
+            future = executor.submit(self._fetch_page, page, per_page)
+
+            while True:
+                logger.info(f"正在获取第 {page} 页...")
+
+                try:
+                    response = future.result()
+                except requests.exceptions.RequestException as e:
+                    logger.error(f"请求失败: {e}")
+                    raise
+
+                # 确定还有下一页且未达到limit时，先发出下一页请求再解析本页
+                future = None
+                if (total_pages is not None and page < total_pages
+                        and (not limit or page * per_page < limit)):
+                    future = executor.submit(self._fetch_page, page + 1, per_page)
+
+                data = orjson.loads(response.content) if HAS_ORJSON else response.json()
                 posts = data.get('posts', [])
+                if total_pages is None:
+                    total_pages = data.get('meta', {}).get('pagination', {}).get('pages')
 
                 if not posts:
                     logger.info("没有更多文章了")
                     break
 
-                all_posts.extend(posts)
-                logger.info(f"获取到 {len(posts)} 篇文章，累计 {len(all_posts)} 篇")
+                pages.append(posts)
+                total += len(posts)
+                logger.info(f"获取到 {len(posts)} 篇文章，累计 {total} 篇")
 
                 # 如果返回的文章数少于每页数量，说明已经获取完所有文章
                 if len(posts) < per_page:
@@ -102,14 +186,22 @@ class GhostPostFetcher:
 
                 page += 1
 
+                if total_pages is not None and page > total_pages:
+                    logger.info("已获取所有文章")
+                    break
+
                 # 如果设置了limit，提前退出
-                if limit and len(all_posts) >= limit:
+                if limit and total >= limit:
                     logger.info(f"已达到限制数量 {limit}")
                     break
 
-            except requests.exceptions.RequestException as e:
-                logger.error(f"请求失败: {e}")
-                raise
+                # 本页没有预取（第一页或不知道总页数）时，现在再请求下一页
+                if future is None:
+                    future = executor.submit(self._fetch_page, page, per_page)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        all_posts = list(islice(chain.from_iterable(pages), limit))
 
         logger.info(f"总共获取到 {len(all_posts)} 篇文章")
         return all_posts
@@ -123,7 +215,7 @@ class GhostPostFetcher:
             output_dir: 输出目录
         """
         output_path = Path(output_dir)
-        output_path.mkdir(exist_ok=True)
+        self._ensure_dir(output_path)
 
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         json_file = output_path / f"ghost_posts_{timestamp}.json"
@@ -138,8 +230,7 @@ class GhostPostFetcher:
             'posts': posts
         }
 
-        with open(json_file, 'w', encoding='utf-8') as f:
-            json.dump(output_data, f, ensure_ascii=False, indent=2)
+        write_json(json_file, output_data)
 
         logger.info(f"JSON文件已保存: {json_file}")
         return json_file
@@ -157,12 +248,20 @@ class GhostPostFetcher:
         if not html_content:
             return ""
 
+        if HAS_SELECTOLAX:
+            # 用C实现的解析器一次遍历DOM直接取出文本
+            tree = HTMLParser(html_content)
+            for node in tree.css('script,style'):
+                node.decompose()
+            return tree.body.text(separator='\n', strip=True) if tree.body else ''
+
+        # 未安装selectolax时退回正则处理
         # 移除script和style标签
-        html_content = re.sub(r'<(script|style)[^>]*>.*?</\1>', '', html_content, flags=re.DOTALL)
+        html_content = _SCRIPT_RE.sub('', html_content)
         # 移除HTML标签但保留换行
-        html_content = re.sub(r'<[^>]+>', '\n', html_content)
+        html_content = _TAG_RE.sub('\n', html_content)
         # 清理多余的空白
-        html_content = re.sub(r'\n+', '\n', html_content)
+        html_content = _WS_RE.sub('\n', html_content)
         return html_content.strip()
 
     def save_as_txt(self, posts: List[Dict], output_dir: str = "posts/txt"):
@@ -174,9 +273,14 @@ class GhostPostFetcher:
             output_dir: 输出目录
         """
         output_path = Path(output_dir)
-        output_path.mkdir(parents=True, exist_ok=True)
+        self._ensure_dir(output_path)
 
-        saved_files = []
+        # 先在内存中生成所有文件内容（纯CPU），再并发写盘
+        paths = []
+        contents = []
+        buf = []
+        add = buf.append
+        rule = '=' * 80
 
         for post in posts:
             # 清理文件名中的非法字符
@@ -184,7 +288,7 @@ class GhostPostFetcher:
             slug = post.get('slug', f"post-{post.get('id', 'unknown')}")
 
             # 生成安全的文件名
-            safe_title = re.sub(r'[<>:"/\\|?*]', '_', title)
+            safe_title = _FNAME_RE.sub('_', title)
             safe_filename = f"{slug}_{safe_title[:50]}.txt"
             file_path = output_path / safe_filename
 
@@ -192,34 +296,44 @@ class GhostPostFetcher:
             html_content = post.get('html', '')
             text_content = self.strip_html_tags(html_content)
 
-            # 准备TXT文件内容
-            txt_content = f"""{'='*80}
-{title}
-{'='*80}
-
-摘要: {post.get('excerpt', '无摘要')}
-
-发布日期: {post.get('published_at', '')}
-
-阅读时间: {post.get('reading_time', 0)} 分钟
-
-标签: {', '.join([tag['name'] for tag in post.get('tags', [])])}
-
-作者: {', '.join([author['name'] for author in post.get('authors', [])])}
-
-{'='*80}
-文章内容
-{'='*80}
-
-{text_content}
-"""
-
-            # 保存文件
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(txt_content)
-
-            saved_files.append(file_path)
+            # 准备TXT文件内容：逐段追加到同一个列表，最后一次性拼接
+            buf.clear()
+            add(rule)
+            add('\n')
+            add(str(title))
+            add('\n')
+            add(rule)
+            add('\n\n摘要: ')
+            add(str(post.get('excerpt', '无摘要')))
+            add('\n\n发布日期: ')
+            add(str(post.get('published_at', '')))
+            add('\n\n阅读时间: ')
+            add(str(post.get('reading_time', 0)))
+            add(' 分钟\n\n标签: ')
+            add(', '.join(tag['name'] for tag in post.get('tags', [])))
+            add('\n\n作者: ')
+            add(', '.join(author['name'] for author in post.get('authors', [])))
+            add('\n\n')
+            add(rule)
+            add('\n文章内容\n')
+            add(rule)
+            add('\n\n')
+            add(text_content)
+            add('\n')
+            txt_content = ''.join(buf)
+
+            paths.append(file_path)
+            contents.append(txt_content)
+
+        # 每篇文章写入不同的文件，可以安全地并发写入
+        def _write(item):
+            file_path, txt_content = item
+            file_path.write_text(txt_content, encoding='utf-8')
             logger.info(f"已保存: {file_path}")
+            return file_path
+
+        with ThreadPoolExecutor(max_workers=8) as ex:
+            saved_files = list(ex.map(_write, zip(paths, contents)))
 
         logger.info(f"TXT文件保存完成，共 {len(saved_files)} 个文件")
         return saved_files
@@ -233,6 +347,7 @@ class GhostPostFetcher:
             output_dir: 输出目录
         """
         output_path = Path(output_dir)
+        self._ensure_dir(output_path)
         index_file = output_path / "index.json"
 
         # 创建简化的索引
@@ -249,8 +364,7 @@ class GhostPostFetcher:
                 'url': post.get('url'),
             })
 
-        with open(index_file, 'w', encoding='utf-8') as f:
-            json.dump(index, f, ensure_ascii=False, indent=2)
+        write_json(index_file, index)
 
         logger.info(f"索引文件已保存: {index_file}")
         return index_file
@@ -268,7 +382,7 @@ class GhostPostFetcher:
         """
         try:
             # 创建输出目录
-            Path(output_dir).mkdir(parents=True, exist_ok=True)
+            self._ensure_dir(output_dir)
 
             # 获取文章
             posts = self.fetch_all_posts(limit=limit)
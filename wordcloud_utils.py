@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""词云生成器 - GUI和CLI共用的文本读取与分词"""
+
+import os
+import mmap
+import sys
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from operator import itemgetter
+
+def _read_one(txt_file):
+    """把单个txt文件只读映射到内存，读取失败时抛出OSError"""
+    try:
+        with open(txt_file, 'rb') as f:
+            # 空文件无法映射
+            if os.fstat(f.fileno()).st_size == 0:
+                return b''
+            # 关闭文件后映射依然有效；非Windows平台不让mmap额外复制一份fd，
+            # 否则打开的fd数量随文件数增长，文件多时会超出 ulimit -n
+            if sys.platform == 'win32':
+                return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ, trackfd=False)
+    except OSError as e:
+        raise OSError(f"读取文件 {txt_file} 时出错: {e}") from e
+
+def read_all_txt_files(txt_dir):
+    """读取指定目录下的所有txt文件并合并文本"""
+    if not os.path.exists(txt_dir):
+        print(f"错误: 目录不存在 {txt_dir}")
+        return ""
+
+    # scandir返回的DirEntry自带文件类型信息，不需要逐个stat
+    # normcase让Windows上的 .TXT 也能匹配，与glob的行为一致；符号链接指向的文件同样读取
+    # 路径不是目录或没有权限时与glob一样当作没有文件，不抛异常
+    try:
+        with os.scandir(txt_dir) as it:
+            txt_files = [e.path for e in it
+                         if os.path.normcase(e.name).endswith('.txt')
+                         and not e.name.startswith('.') and e.is_file()]
+    except OSError:
+        txt_files = []
+
+    print(f"找到 {len(txt_files)} 个txt文件")
+
+    if not txt_files:
+        return ""
+
+    # 文件读取是IO密集型，用线程池并发读取，最后一次性拼接
+    # 任一文件读取失败都直接报错，不能悄悄少读一部分语料
+    with ThreadPoolExecutor(max_workers=min(32, len(txt_files))) as ex:
+        futures = [ex.submit(_read_one, p) for p in txt_files]
+        chunks = []
+        try:
+            for future in futures:
+                chunks.append(future.result())
+        except OSError:
+            for chunk in chunks:
+                if isinstance(chunk, mmap.mmap):
+                    chunk.close()
+            raise
+
+    print(f"成功读取 {len(chunks)} 个文件")
+    # 所有文件的字节直接拼接，只做一次解码
+    try:
+        return b"\n".join(chunks).decode('utf-8', 'replace')
+    finally:
+        for chunk in chunks:
+            if isinstance(chunk, mmap.mmap):
+                chunk.close()
+
+def _fuse_counts(counts, normalize_plurals=True):
+    """与 wordcloud.tokenization.process_tokens 相同的大小写合并和复数归并，输入是已计好数的Counter"""
+    d = defaultdict(dict)
+    for word, count in counts.items():
+        case_dict = d[word.lower()]
+        case_dict[word] = case_dict.get(word, 0) + count
+    merged_plurals = {}
+    if normalize_plurals:
+        for key in list(d.keys()):
+            if key.endswith('s') and not key.endswith('ss'):
+                key_singular = key[:-1]
+                if key_singular in d:
+                    dict_singular = d[key_singular]
+                    for word, count in d[key].items():
+                        singular = word[:-1]
+                        dict_singular[singular] = dict_singular.get(singular, 0) + count
+                    merged_plurals[key] = key_singular
+                    del d[key]
+    fused_cases = {}
+    standard_cases = {}
+    for word_lower, case_dict in d.items():
+        # 取出现最多的大小写形式
+        first = max(case_dict.items(), key=itemgetter(1))[0]
+        fused_cases[first] = sum(case_dict.values())
+        standard_cases[word_lower] = first
+    for plural, singular in merged_plurals.items():
+        standard_cases[plural] = standard_cases[singular]
+    return fused_cases, standard_cases
+
+# 可选的Numba加速分词：安装了numba时预先统计词频，否则交给WordCloud自带的分词
+try:
+    import numpy as np
+    from numba import njit, types
+    from numba.typed import Dict
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+# CJK统一表意文字范围，每个汉字作为单独的词
+CJK_LO, CJK_HI = 0x4E00, 0x9FFF
+
+@lru_cache(maxsize=1)
+def _word_char_table():
+    """按码点查表判断是否为单词字符（与正则 \\w 相同：字母、数字和下划线），覆盖全部Unicode，只构建一次"""
+    table = np.fromiter((chr(i).isalnum() for i in range(0x110000)),
+                        dtype=np.bool_, count=0x110000)
+    table[ord('_')] = True
+    return table
+
+if HAS_NUMBA:
+    @njit(cache=True)
+    def _same_word(arr, a, b, length):
+        for j in range(length):
+            if arr[a + j] != arr[b + j]:
+                return False
+        return True
+
+    @njit(cache=True)
+    def tokenize_count(arr, is_word, is_cjk_lo, is_cjk_hi):
+        """遍历码点数组，汉字单字成词、其余按正则 \\w[\\w']* 成词，返回每个词首次出现的(起点, 长度)和次数"""
+        n = arr.shape[0]
+        starts = np.empty(n, np.int64)
+        lens = np.empty(n, np.int64)
+        counts = np.zeros(n, np.int64)
+        seen = Dict.empty(key_type=types.uint64, value_type=types.int64)
+        ntok = 0
+        i = 0
+        while i < n:
+            c = arr[i]
+            start = i
+            if is_cjk_lo <= c <= is_cjk_hi:
+                i += 1
+            elif is_word[c]:
+                # 撇号可以出现在词中间或末尾（don't），但不能开头
+                i += 1
+                while (i < n and (is_word[arr[i]] or arr[i] == 39)
+                       and not is_cjk_lo <= arr[i] <= is_cjk_hi):
+                    i += 1
+            else:
+                i += 1
+                continue
+            length = i - start
+
+            # FNV-1a 哈希，区分大小写，大小写的合并留给 _fuse_counts
+            h = np.uint64(14695981039346656037)
+            for j in range(start, i):
+                h = (h ^ np.uint64(arr[j])) * np.uint64(1099511628211)
+
+            while True:
+                if h not in seen:
+                    seen[h] = ntok
+                    starts[ntok] = start
+                    lens[ntok] = length
+                    counts[ntok] = 1
+                    ntok += 1
+                    break
+                k = seen[h]
+                if lens[k] == length and _same_word(arr, starts[k], start, length):
+                    counts[k] += 1
+                    break
+                # 哈希冲突：换一个键继续探测，不同的词不会被合并
+                h = (h + np.uint64(1)) * np.uint64(1099511628211)
+        return starts[:ntok], lens[:ntok], counts[:ntok]
+
+def count_words(text, stopwords=(), normalize_plurals=True):
+    """
+    用Numba内核统计词频，返回 {词: 次数}
+    除汉字按单字成词外，结果与 WordCloud(collocations=False).process_text 一致
+    """
+    arr = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+    starts, lens, counts = tokenize_count(arr, _word_char_table(), CJK_LO, CJK_HI)
+    stopwords = {w.lower() for w in stopwords}
+    word_counts = Counter()
+    for start, length, count in zip(starts.tolist(), lens.tolist(), counts.tolist()):
+        word = text[start:start + length]
+        # 与process_text相同：去掉 's，丢弃纯数字和停用词
+        if word.lower().endswith("'s"):
+            word = word[:-2]
+        if word.isdigit() or word.lower() in stopwords:
+            continue
+        word_counts[word] += count
+    # 大小写合并和复数归并与WordCloud一致
+    return _fuse_counts(word_counts, normalize_plurals)[0]
@@ -1,4 +1,5 @@
 import turtle as t
+import numpy as np
 
 t.title('自动轨迹绘制')
 t.setup(800, 600, 0, 0)
@@ -8,51 +9,48 @@ t.pensize(5)
 t.colormode(255) 
 
 # --- 优化后的数据读取 ---
-datals = []
+# 一次性把整个文件读成 (N,6) 的浮点数组，不再对每个数字调用eval
+# 空行会被自动跳过，多余的列（如 "1,2,3,4,5,6," 末尾的逗号）通过usecols忽略
+# 列数不足或含非数字的行会被丢弃
 try:
-    with open("data.txt", "r", encoding="utf-8") as f:
-        lines = f.readlines()
-        
-    for index, line in enumerate(lines):
-        line = line.strip() # 去除换行符和首尾空格
-        
-        # 如果是空行，直接跳过
-        if not line:
-            continue
-            
-        try:
-            # 这里的逻辑是：分割 -> 转数值 -> 存入列表
-            # 过滤掉分割后可能产生的空字符（防止如 "1,2,3," 这种情况）
-            parts = [x for x in line.split(",") if x.strip() != '']
-            row_data = list(map(eval, parts))
-            datals.append(row_data)
-        except Exception as e:
-            print(f"第 {index+1} 行数据格式有误，已跳过: {line}")
-            print(f"错误原因: {e}")
-
+    datals = np.genfromtxt("data.txt", delimiter=",", dtype=np.float64,
+                           usecols=range(6), invalid_raise=False, ndmin=2)
+    datals = datals[~np.isnan(datals).any(axis=1)]
+    # 没有任何有效行时genfromtxt返回的形状是(0, 1)，统一成(0, 6)
+    if datals.size == 0:
+        datals = datals.reshape(-1, 6)
 except FileNotFoundError:
     print("错误：找不到 data.txt 文件")
+    datals = np.empty((0, 6))
 
 # 打印一下读到的数据，确认是否正确
 print(f"成功读取 {len(datals)} 行数据")
 # print(datals) # 如果需要可以把这行注释打开看看具体数据
 
-# --- 自动绘制 ---
-for i in range(len(datals)):
-    # 支持6个值
-    if len(datals[i]) < 6:
-        print(f"第 {i+1} 条指令数据不足6个，跳过")
-        continue
-
-    # 这里注意：如果你的txt里颜色是小数(0.5)，上面不要开colormode(255)
-    # 如果是整数(255)，必须开
-    t.pencolor(datals[i][3], datals[i][4], datals[i][5])
-    t.fd(datals[i][0])
-    if datals[i][1]:
-        t.right(datals[i][2])
-    else:
-        t.left(datals[i][2])
+# 按列拆成连续数组，绘制时不再逐行取下标
+fd_arr = datals[:, 0]
+turn_arr = datals[:, 1].astype(bool)
+ang_arr = datals[:, 2]
+# 上面开了colormode(255)，颜色必须是0~255的整数
+rgb = datals[:, 3:6].astype(np.int64)
 
+# --- 自动绘制 ---
+# 关闭动画，所有指令画完后只刷新一次屏幕
+t.tracer(0)
+t.hideturtle()
+
+# 每次pencolor/fd都是一次Tk调用，颜色不变或距离为0时直接跳过
+prev = (-1, -1, -1)
+for i in range(len(fd_arr)):
+    cur = tuple(rgb[i].tolist())
+    if cur != prev:
+        t.pencolor(*cur)
+        prev = cur
+    if fd_arr[i] != 0:
+        t.fd(fd_arr[i])
+    (t.right if turn_arr[i] else t.left)(ang_arr[i])
+
+t.update()
 t.done()
 exit()
 